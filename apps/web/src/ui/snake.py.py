@@ -3,14 +3,28 @@ import pygame
 import sys
 import time
 import random
+from collections import deque
+from itertools import islice
 
 # Initialize Pygame
 pygame.init()
 
+# Only QUIT, KEYDOWN and expose events are handled; let SDL drop everything
+# else before it reaches the Python event queue. Expose events matter because
+# frames normally push only dirty rects, so an uncovered or restored window
+# needs one full update.
+EXPOSE_EVENTS = [pygame.VIDEOEXPOSE] + ([pygame.WINDOWEXPOSED] if hasattr(pygame, 'WINDOWEXPOSED') else [])
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN] + EXPOSE_EVENTS)
+
 # Set up some constants
 WIDTH = 800
 HEIGHT = 600
-FPS = 10
+FPS = 10  # simulation steps per second
+MAX_FPS = 240  # render cap, only there to yield the CPU
+
+# Every 20x20 grid cell, built once
+GRID_CELLS = tuple((x, y) for x in range(0, WIDTH, 20) for y in range(0, HEIGHT, 20))
 
 # Create the game window
 window = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -20,46 +34,64 @@ WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 
+# Direction lookups
+DELTA = {'UP': (0, -20), 'DOWN': (0, 20), 'LEFT': (-20, 0), 'RIGHT': (20, 0)}
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+KEYMAP = {pygame.K_UP: 'UP', pygame.K_DOWN: 'DOWN', pygame.K_LEFT: 'LEFT', pygame.K_RIGHT: 'RIGHT'}
+
 # Set up the font for the score
 font = pygame.font.Font(None, 36)
 
 class SnakeGame:
     def __init__(self):
-        self.snake = [(200, 200), (220, 200), (240, 200)]
+        self.snake = deque([(200, 200), (220, 200), (240, 200)])
+        # Every segment except the head, for O(1) self-collision tests
+        self._occupied = set(islice(self.snake, len(self.snake) - 1))
         self.direction = 'RIGHT'
         self.apple = None
+        # One display-format segment surface, blitted for every body cell
+        self.seg_surf = pygame.Surface((20, 20))
+        self.seg_surf.fill(GREEN)
+        self.seg_surf = self.seg_surf.convert()
 
     def draw_snake(self):
-        for x, y in self.snake:
-            pygame.draw.rect(window, GREEN, (x, y, 20, 20))
+        window.blits([(self.seg_surf, pos) for pos in self.snake], doreturn=False)
 
     def move_snake(self):
         head = self.snake[-1]
-        if self.direction == 'UP':
-            new_head = (head[0], head[1] - 20)
-        elif self.direction == 'DOWN':
-            new_head = (head[0], head[1] + 20)
-        elif self.direction == 'LEFT':
-            new_head = (head[0] - 20, head[1])
-        elif self.direction == 'RIGHT':
-            new_head = (head[0] + 20, head[1])
+        dx, dy = DELTA[self.direction]
+        new_head = (head[0] + dx, head[1] + dy)
 
-        self.snake.append(new_head)
+        self.append_segment(new_head)
 
         if self.apple == None:
-            self.apple = random.choice([(x//20*20, y//20*20) for x in range(0, WIDTH, 20) for y in range(0,
-HEIGHT, 20)])
+            self.apple = self.random_apple()
 
         if new_head[0] < 0 or new_head[0] > WIDTH - 20:
             self.direction = 'UP' if new_head[1] == 200 else 'DOWN'
         elif new_head[1] < 0 or new_head[1] > HEIGHT - 20:
             self.direction = 'LEFT' if new_head[0] == 200 else 'RIGHT'
 
-        for x, y in self.snake[:-1]:
-            if (new_head[0] == x and new_head[1] == y):
-                return False
+        return new_head not in self._occupied
+
+    def append_segment(self, cell):
+        self._occupied.add(self.snake[-1])
+        self.snake.append(cell)
 
-        return True
+    def is_occupied(self, cell):
+        return cell in self._occupied or cell == self.snake[-1]
+
+    def random_apple(self):
+        # Sample a grid cell directly instead of building the full cell list,
+        # resampling on the (rare) hit against the snake body.
+        head = self.snake[-1]
+        for _ in range(32):
+            cell = (random.randrange(0, WIDTH, 20), random.randrange(0, HEIGHT, 20))
+            if cell not in self._occupied and cell != head:
+                return cell
+        # Board is mostly snake: pick from the free cells of the precomputed grid
+        free = [c for c in GRID_CELLS if c not in self._occupied and c != head]
+        return random.choice(free) if free else None
 
     def check_collision(self):
         head = self.snake[-1]
@@ -70,10 +102,7 @@ HEIGHT, 20)])
             if head[0] == 200:
                 return True
 
-        for x, y in self.snake[:-1]:
-            if (head[0] == x and head[1] == y):
-                return True
-        return False
+        return head in self._occupied
 
     def check_apple_collision(self):
         if self.apple == None or not ((self.apple[0] - 20) // 20 == self.snake[-1][0] // 20 and (self.apple[1] -
@@ -88,47 +117,88 @@ HEIGHT, 20)])
 def main():
     clock = pygame.time.Clock()
     game = SnakeGame()
-
-    while True:
+    # Last rendered score and its surface, so text is only rasterized on change
+    text_score, text = None, None
+
+    # Paint the first frame in full; afterwards only the changed cells and the
+    # score area are redrawn and pushed to the display.
+    window.fill(WHITE)
+    game.draw_snake()
+    pygame.display.update()
+    drawn = len(game.snake)
+    score_rect = None
+    score = game.get_score()
+
+    # Fixed-timestep simulation: the snake advances once per STEP of wall time
+    # regardless of how often frames are rendered.
+    step = 1 / FPS
+    accumulator = 0.0
+    last = time.perf_counter()
+    alive = True
+
+    while alive:
+        exposed = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type in EXPOSE_EVENTS:
+                exposed = True
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP and game.direction != 'DOWN':
-                    game.direction = 'UP'
-                elif event.key == pygame.K_DOWN and game.direction != 'UP':
-                    game.direction = 'DOWN'
-                elif event.key == pygame.K_LEFT and game.direction != 'RIGHT':
-                    game.direction = 'LEFT'
-                elif event.key == pygame.K_RIGHT and game.direction != 'LEFT':
-                    game.direction = 'RIGHT'
-
-        game.apple = None
-
-        if not game.move_snake():
-            break
-        game.apple = random.choice([(x//20*20, y//20*20) for x in range(0, WIDTH, 20) for y in range(0, HEIGHT,
-20)])
-
-        score = game.get_score()
-        if game.check_apple_collision() and not ((game.apple[0] - 20) // 20 == (200 - 20) // 20 and (game.apple[1]
+                d = KEYMAP.get(event.key)
+                if d and OPPOSITE[d] != game.direction:
+                    game.direction = d
+
+        now = time.perf_counter()
+        # Clamp so a stall (e.g. dragging the window) doesn't replay every missed step at once
+        accumulator = min(accumulator + now - last, 5 * step)
+        last = now
+        while accumulator >= step:
+            accumulator -= step
+
+            if not game.move_snake():
+                alive = False
+                break
+
+            score = game.get_score()
+            if game.check_apple_collision() and not ((game.apple[0] - 20) // 20 == (200 - 20) // 20 and (game.apple[1]
 - 20) // 20 == (200 - 20) // 20):
-            score += 1
-            game.snake.append((220, 200))
-        elif not game.check_collision():
-            if len(game.snake) > score:
-                score -= 1
-
-        window.fill(WHITE)
-
-        game.draw_snake()
-
-        text = font.render(f'Score: {score}', True, RED)
-        window.blit(text, (10, 10))
+                score += 1
+                game.append_segment((220, 200))
+                game.apple = None  # move_snake places a new one next step
+            elif not game.check_collision():
+                if len(game.snake) > score:
+                    score -= 1
+        if not alive:
+            break
 
-        pygame.display.update()
-        clock.tick(FPS)
+        # The snake only ever grows, so drawing the segments appended since the
+        # last frame (new head plus any growth) is enough. Walk them from the
+        # head end of the deque; islice from the left would be O(len) per frame.
+        dirty = window.blits([(game.seg_surf, pos)
+                              for pos in islice(reversed(game.snake), len(game.snake) - drawn)])
+        drawn = len(game.snake)
+
+        if score != text_score:
+            text_score, text = score, font.render(f'Score: {score}', True, RED).convert_alpha()
+        area = text.get_rect(topleft=(10, 10))
+        if score_rect is not None:
+            area.union_ip(score_rect)
+        window.fill(WHITE, area)
+        # The text has a transparent background: restore snake cells under it first
+        window.blits([(game.seg_surf, (x, y))
+                      for x in range(area.left // 20 * 20, area.right, 20)
+                      for y in range(area.top // 20 * 20, area.bottom, 20)
+                      if game.is_occupied((x, y))], doreturn=False)
+        score_rect = window.blit(text, (10, 10))
+        dirty.append(area)
+
+        if exposed:
+            pygame.display.update()  # the window surface still holds the whole frame
+        else:
+            # Keep the list short; many tiny rects make update() slower than a full flip
+            pygame.display.update(dirty)
+        clock.tick(MAX_FPS)
 
     if not game.check_collision():
         print('Game Over! Final score:', game.get_score())
@@ -20,12 +20,17 @@ Usage:
 """
 
 import os
+import re
 import sys
 import json
 import shutil
 import subprocess
+import threading
+from importlib.metadata import distributions
 from pathlib import Path
 
+from run import pipe_with_prefix
+
 ROOT   = Path(__file__).parent.resolve()
 SERVER = ROOT / "apps" / "server"
 WEB    = ROOT / "apps" / "web"
@@ -71,6 +76,30 @@ def run(cmd, cwd=None, allow_fail=False, env=None):
         sys.exit(r.returncode)
     return r.returncode
 
+def run_parallel(jobs: list[tuple[list[str], Path]]):
+    """Like run(), for several (cmd, cwd) jobs started together; each output line is tagged with its folder."""
+    procs = []
+    try:
+        for cmd, cwd in jobs:
+            print(f"\n[RUN] {' '.join(cmd)} (cwd={cwd})")
+            sys.stdout.flush()  # children's output bypasses our text buffer
+            p = subprocess.Popen(cmd, cwd=cwd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            t = threading.Thread(target=pipe_with_prefix, args=(p.stdout, f"[{Path(cwd).name}] "))
+            t.start()
+            procs.append((p, t))
+        codes = [p.wait() for p, _ in procs]
+        for _, t in procs:
+            t.join()
+    finally:
+        for p, _ in procs:
+            if p.poll() is None:
+                p.terminate()
+                p.wait()
+    rc = next((c for c in codes if c), 0)
+    if rc:
+        print(f"[ERR] exit {rc}")
+        sys.exit(rc)
+
 def npm_bin():
     p = shutil.which("npm.cmd") or shutil.which("npm")
     if not p:
@@ -159,20 +188,33 @@ def clean(folder: Path):
             shutil.rmtree(p, ignore_errors=True)
             print(f"[OK] removed {p}")
 
-def npm_has_pkg(npm: str, folder: Path, pkg: str) -> bool:
-    # `npm ls <pkg> --depth=0` returns 0 if installed locally
-    r = subprocess.run([npm, "ls", pkg, "--depth=0"], cwd=folder, shell=False,
-                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    return r.returncode == 0
-
-def npm_install_if_missing(npm: str, folder: Path, pkgs: list[str], dev: bool = False):
+def npm_list(npm: str, folder: Path) -> set[str]:
+    """Names of packages installed for the package in folder, from a single `npm ls` call."""
+    # `npm ls` exits non-zero on missing/extraneous deps but still prints the tree
+    r = subprocess.run([npm, "ls", "--depth=0", "--json"], cwd=folder, shell=False,
+                       capture_output=True, text=True)
+    try:
+        tree = json.loads(r.stdout or "{}") or {}
+        name = json.loads((folder / "package.json").read_text(encoding="utf-8")).get("name")
+    except (ValueError, OSError):
+        return set()
+    deps = tree.get("dependencies", {})
+    # Inside an npm workspace member (apps/server, apps/web are members of the
+    # root package.json), the tree is rooted at the workspace root and the
+    # top level only holds the member itself; its deps are nested under it.
+    if name and tree.get("name") != name and name in deps:
+        deps = deps[name].get("dependencies", {})
+    return {dep for dep, info in deps.items() if not info.get("missing")}
+
+def npm_install_if_missing(npm: str, folder: Path, pkgs: list[str], installed: set[str], dev: bool = False):
     flag = ["-D"] if dev else []
-    missing = [p for p in pkgs if not npm_has_pkg(npm, folder, p)]
+    missing = [p for p in pkgs if p not in installed]
     if not missing:
         print(f"[OK] all {'dev ' if dev else ''}packages already present in {folder}")
         return
     print(f"[STEP] Installing missing {'dev ' if dev else ''}packages in {folder}: {', '.join(missing)}")
     run([npm, "install", "--no-package-lock", *flag, *missing], cwd=folder)
+    installed.update(missing)
 
 def ensure_local_install(npm: str, folder: Path):
     """If node_modules is missing, do a plain npm install to satisfy repo deps."""
@@ -182,13 +224,29 @@ def ensure_local_install(npm: str, folder: Path):
     else:
         print(f"[OK] node_modules present in {folder}; skipping bulk install")
 
-def pip_show(pkg: str) -> bool:
-    r = subprocess.run([sys.executable, "-m", "pip", "show", pkg],
-                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    return r.returncode == 0
+def pip_normalize(name: str) -> str:
+    # PEP 503 name normalization
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def pip_list() -> set[str]:
+    """Normalized names of installed Python distributions.
+
+    Read in-process via importlib.metadata; falls back to a single `pip list` call.
+    """
+    try:
+        return {pip_normalize(d.metadata["Name"]) for d in distributions() if d.metadata["Name"]}
+    except Exception:
+        pass
+    r = subprocess.run([sys.executable, "-m", "pip", "list", "--format=json"],
+                       capture_output=True, text=True)
+    try:
+        return {pip_normalize(d["name"]) for d in json.loads(r.stdout or "[]")}
+    except (ValueError, KeyError, TypeError):
+        return set()
 
 def pip_install_if_missing(pkgs: list[str]):
-    missing = [p for p in pkgs if not pip_show(p)]
+    installed = pip_list()
+    missing = [p for p in pkgs if pip_normalize(p) not in installed]
     if not missing:
         print("[OK] all Python packages already satisfied")
         return
@@ -217,8 +275,9 @@ def main():
     # ---- Server ----
     ensure_pkg_json(SERVER, "@argon/server")
     rm_lockfiles(SERVER)
-    npm_install_if_missing(npm, SERVER, SERVER_RUNTIME, dev=False)
-    npm_install_if_missing(npm, SERVER, SERVER_DEV, dev=True)
+    installed = npm_list(npm, SERVER)
+    npm_install_if_missing(npm, SERVER, SERVER_RUNTIME, installed, dev=False)
+    npm_install_if_missing(npm, SERVER, SERVER_DEV, installed, dev=True)
     ensure_local_install(npm, SERVER)
     write_ts_shims(SERVER)
     ensure_tsconfig_server()
@@ -226,8 +285,9 @@ def main():
     # ---- Web ----
     ensure_pkg_json(WEB, "@argon/web")
     rm_lockfiles(WEB)
-    npm_install_if_missing(npm, WEB, WEB_RUNTIME, dev=False)
-    npm_install_if_missing(npm, WEB, WEB_DEV, dev=True)
+    installed = npm_list(npm, WEB)
+    npm_install_if_missing(npm, WEB, WEB_RUNTIME, installed, dev=False)
+    npm_install_if_missing(npm, WEB, WEB_DEV, installed, dev=True)
     ensure_local_install(npm, WEB)
     write_ts_shims(WEB)   # harmless; future-proof
 
@@ -239,8 +299,7 @@ def main():
     # ------------- Build (one-time) -------------
     if want_build:
         print("\n[STEP] Building server + web…")
-        run([npm, "run", "build"], cwd=SERVER)
-        run([npm, "run", "build"], cwd=WEB)
+        run_parallel([([npm, "run", "build"], SERVER), ([npm, "run", "build"], WEB)])
         print("\n[OK] Build complete.")
     else:
         print("\n[STEP] Skipping build (per --no-build)")
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os, sys, subprocess, webbrowser, shutil
+import os, sys, subprocess, webbrowser, shutil, json, threading, queue, time
+from functools import lru_cache
 from pathlib import Path
 import importlib.util
 import platform
@@ -14,18 +15,39 @@ DATA_DIR = ROOT / "data" / "rag"
 DEFAULT_PORT   = os.environ.get("PORT", "8787")
 DEFAULT_OLLAMA = os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434")
 
-# Enhanced RAG Python dependencies
-REQUIRED_PYTHON_PACKAGES = [
-    "fitz",  # pymupdf
-    "pymupdf4llm", 
-    "pdfminer",
-    "pdfplumber",
-    "camelot", 
-    "tabula",
-    "docx",  # python-docx
-    "pytesseract",
-    "PIL"  # Pillow
-]
+# Environment for short-lived Python probe processes: no .pyc write-back,
+# unbuffered output
+PROBE_ENV = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONUNBUFFERED": "1"}
+
+# Enhanced RAG Python dependencies: import name -> package name
+REQUIRED_PYTHON_PACKAGES = {
+    "fitz": "pymupdf",
+    "pymupdf4llm": "pymupdf4llm",
+    "pdfminer": "pdfminer.six",
+    "pdfplumber": "pdfplumber",
+    "camelot": "camelot-py",
+    "tabula": "tabula-py",
+    "docx": "python-docx",
+    "pytesseract": "pytesseract",
+    "PIL": "Pillow"
+}
+
+PROBE_TIMEOUT = 10  # seconds allowed per import
+
+# Child script: imports each name given on the command line and reports one JSON
+# line per import as soon as it finishes
+PROBE_SCRIPT = '''
+import sys, json
+for import_name in sys.argv[1:]:
+    try:
+        __import__(import_name)
+        status, error = "ok", ""
+    except ImportError as e:
+        status, error = "missing", str(e)
+    except Exception as e:
+        status, error = "error", str(e)
+    print(json.dumps({"name": import_name, "status": status, "error": error}), flush=True)
+'''
 
 def is_windows():
     return platform.system().lower() == "windows"
@@ -69,6 +91,57 @@ def sh(cmd, cwd=None, allow_fail=False, env=None, capture_output=False):
             sys.exit(1)
         return None
 
+def pipe_with_prefix(stream, prefix):
+    """Copy a child's binary output to our stdout line by line, tagged with prefix.
+
+    Bytes are passed through untouched, so a character our console can't encode
+    can't kill the thread, and the pipe is always drained to EOF so the child
+    never blocks on a full buffer.
+    """
+    out = getattr(sys.stdout, "buffer", None)
+    tag = prefix.encode("utf-8")
+    for line in stream:
+        try:
+            if out is not None:
+                out.write(tag + line)
+                out.flush()
+            else:
+                print(prefix + line.decode("utf-8", "replace"), end="", flush=True)
+        except Exception:
+            pass  # keep draining even if our own stdout is broken
+
+def sh_parallel(jobs):
+    """Like sh(), but starts every (cmd, cwd) job at once and waits for all of them"""
+    procs, pipes = [], []
+    try:
+        for cmd, cwd in jobs:
+            print(f"\n[RUN] {' '.join(cmd)} (cwd={cwd})")
+            sys.stdout.flush()  # children's output bypasses our text buffer
+            p = subprocess.Popen(cmd, cwd=cwd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            procs.append(p)
+            # Tag each output line with its folder so interleaved logs stay readable
+            t = threading.Thread(target=pipe_with_prefix, args=(p.stdout, f"[{Path(cwd).name}] "))
+            t.start()
+            pipes.append(t)
+        codes = [p.wait() for p in procs]
+        for t in pipes:
+            t.join()
+    except KeyboardInterrupt:
+        print("\n[INFO] Interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"[ERR] Command execution failed: {e}")
+        sys.exit(1)
+    finally:
+        # Never leave a started job running behind us
+        for p in procs:
+            if p.poll() is None:
+                p.terminate()
+                p.wait()
+    rc = next((c for c in codes if c), 0)
+    if rc:
+        sys.exit(rc)
+
 def ensure_node():
     node = shutil.which("node") or "node"
     npm  = npm_path()
@@ -77,72 +150,85 @@ def ensure_node():
     return node, npm
 
 def check_python_package(package_name, python_cmd=None):
-    """Check if a Python package is available using subprocess for Windows compatibility"""
+    """Check if a Python package is available (served from the cached import probe)"""
     if not python_cmd:
         python_cmd = python_path()
-    
-    try:
-        # Use subprocess to check package availability - more reliable on Windows
-        result = subprocess.run([
-            python_cmd, "-c", f"import {package_name}; print('OK')"
-        ], capture_output=True, text=True, timeout=10)
-        
-        return result.returncode == 0 and "OK" in result.stdout
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        return False
+    status, _ = probe_python_imports(python_cmd).get(package_name, ("missing", ""))
+    return status == "ok"
 
 def check_system_command(cmd):
     """Check if a system command is available"""
     return shutil.which(cmd) is not None
 
-def test_python_imports(python_cmd):
-    """Test Python package imports with detailed output"""
-    test_script = '''
-import sys
-packages_to_test = {
-    "fitz": "pymupdf", 
-    "pymupdf4llm": "pymupdf4llm",
-    "pdfminer": "pdfminer.six",
-    "pdfplumber": "pdfplumber", 
-    "camelot": "camelot-py",
-    "tabula": "tabula-py",
-    "docx": "python-docx",
-    "pytesseract": "pytesseract",
-    "PIL": "Pillow"
-}
+def _enqueue_lines(stream, lines):
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
 
-results = {}
-for import_name, package_name in packages_to_test.items():
-    try:
-        __import__(import_name)
-        results[package_name] = True
-        print(f"✓ {package_name}")
-    except ImportError as e:
-        results[package_name] = False
-        print(f"✗ {package_name} - {str(e)}")
-    except Exception as e:
-        results[package_name] = False
-        print(f"? {package_name} - {str(e)}")
+@lru_cache(maxsize=None)
+def probe_python_imports(python_cmd):
+    """Quietly import every required package in a child interpreter.
 
-available = sum(results.values())
-total = len(results)
-print(f"\\nSUMMARY: {available}/{total} packages available")
-'''
-    
-    try:
-        result = subprocess.run([python_cmd, "-c", test_script], 
-                              capture_output=True, text=True, timeout=30)
-        print(f"[PYTHON TEST] Output:\n{result.stdout}")
-        if result.stderr:
-            print(f"[PYTHON TEST] Errors:\n{result.stderr}")
-        
-        # Count available packages from output
-        available = result.stdout.count("✓")
-        return available >= len(REQUIRED_PYTHON_PACKAGES) // 2
-        
-    except Exception as e:
-        print(f"[PYTHON TEST] Failed: {e}")
-        return False
+    Returns {import_name: (status, error)} with status "ok", "missing" or "error".
+    One child normally covers all packages; if a single import takes longer than
+    PROBE_TIMEOUT the child is killed, that package is marked as failed and the
+    remaining ones are probed in a fresh child. Cached per interpreter.
+    """
+    results = {}
+    pending = list(REQUIRED_PYTHON_PACKAGES)
+    while pending:
+        try:
+            p = subprocess.Popen([python_cmd, "-c", PROBE_SCRIPT, *pending], env=PROBE_ENV,
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                 text=True, encoding="utf-8", errors="replace")
+        except Exception as e:
+            for name in pending:
+                results[name] = ("error", str(e))
+            break
+
+        lines = queue.Queue()
+        threading.Thread(target=_enqueue_lines, args=(p.stdout, lines), daemon=True).start()
+        failure = None
+        deadline = time.monotonic() + PROBE_TIMEOUT
+        while pending:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                failure = f"import timed out after {PROBE_TIMEOUT}s"
+                break
+            if line is None:
+                failure = "probe process exited unexpectedly"
+                break
+            try:
+                report = json.loads(line)
+                name = report["name"]
+            except (ValueError, TypeError, KeyError):
+                continue  # stray output printed by an imported package
+            if name in pending:
+                results[name] = (report["status"], report["error"])
+                pending.remove(name)
+                deadline = time.monotonic() + PROBE_TIMEOUT
+
+        if p.poll() is None:
+            p.kill()
+        p.wait()
+        if failure and pending:
+            # The child reports in order, so the first pending name is the one it was stuck on
+            results[pending.pop(0)] = ("error", failure)
+    return results
+
+def test_python_imports(python_cmd):
+    """Test Python package imports with detailed output"""
+    results = probe_python_imports(python_cmd)
+    marks = {"ok": "✓", "missing": "✗", "error": "?"}
+    report = []
+    for import_name, package_name in REQUIRED_PYTHON_PACKAGES.items():
+        status, error = results[import_name]
+        report.append(f"{marks[status]} {package_name}" + (f" - {error}" if error else ""))
+    available = sum(status == "ok" for status, _ in results.values())
+    report.append(f"\nSUMMARY: {available}/{len(results)} packages available")
+    print("[PYTHON TEST] Output:\n" + "\n".join(report))
+    return available
 
 def check_python_environment():
     """Check Python environment and dependencies - Windows compatible"""
@@ -151,7 +237,7 @@ def check_python_environment():
     
     # Check Python version
     try:
-        result = subprocess.run([python_cmd, "--version"], 
+        result = subprocess.run([python_cmd, "--version"], env=PROBE_ENV,
                                capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
             print(f"[INFO] Python version: {result.stdout.strip()}")
@@ -163,10 +249,11 @@ def check_python_environment():
         return False
     
     print(f"\n[CHECK] Testing package imports...")
-    return test_python_imports(python_cmd)
+    available = test_python_imports(python_cmd)
+    return available >= len(REQUIRED_PYTHON_PACKAGES) // 2
 
-def setup_enhanced_rag_environment():
-    """Setup environment variables for enhanced RAG"""
+def setup_enhanced_rag_environment(env):
+    """Setup environment variables for enhanced RAG (updates env in place)"""
     python_cmd = python_path()
     
     # Test core packages for table extraction
@@ -187,7 +274,6 @@ def setup_enhanced_rag_environment():
     has_libreoffice = check_system_command("libreoffice") or check_system_command("soffice")
     
     # Set environment variables
-    env = os.environ.copy()
     env["PYTHON_PATH"] = python_cmd
     
     # Enable features based on what's actually available
@@ -231,14 +317,10 @@ def setup_enhanced_rag_environment():
 
 def build_all(npm_cmd: str):
     # Builds both apps; assumes deps are already installed by install_deps.py
-    sh([npm_cmd, "run", "build"], cwd=str(SERVER))
-    sh([npm_cmd, "run", "build"], cwd=str(WEB))
-
-def start_server(enhanced_env=None):
-    env = enhanced_env or os.environ.copy()
-    env.setdefault("PORT", DEFAULT_PORT)
-    env.setdefault("OLLAMA_URL", DEFAULT_OLLAMA)
+    # Server and web builds don't depend on each other
+    sh_parallel([([npm_cmd, "run", "build"], str(SERVER)), ([npm_cmd, "run", "build"], str(WEB))])
 
+def start_server(env):
     dist_index = SERVER / "dist" / "index.js"
     if not dist_index.exists():
         print(f"[ERR] Server build not found at {dist_index}.")
@@ -275,33 +357,39 @@ def parse_args(argv):
             opts["force_basic"] = True
     return opts
 
-def main():
-    print("[INFO] Argon Enhanced RAG Runner (Windows Compatible)")
-    ensure_node()
-    npm_cmd = npm_path()
+def _build_env(opts):
+    """Build the server environment once: os.environ plus defaults and RAG feature flags"""
+    env = os.environ.copy()
+    env.setdefault("PORT", DEFAULT_PORT)
+    env.setdefault("OLLAMA_URL", DEFAULT_OLLAMA)
 
-    opts = parse_args(sys.argv)
-    
-    # Setup enhanced RAG environment
-    enhanced_env = None
     if not opts["force_basic"]:
         if opts["force_enable"]:
             print("\n[INFO] Force enabling all features (--force-enable)")
-            enhanced_env = os.environ.copy()
-            enhanced_env["PYTHON_PATH"] = python_path()
-            enhanced_env["RAG_ENABLE_TABLES"] = "1"
-            enhanced_env["RAG_ENABLE_OCR"] = "1"
+            env["PYTHON_PATH"] = python_path()
+            env["RAG_ENABLE_TABLES"] = "1"
+            env["RAG_ENABLE_OCR"] = "1"
         elif not opts["no_python_check"]:
             print("\n[STEP] Checking Python environment for Enhanced RAG...")
-            python_available = check_python_environment()
-            enhanced_env = setup_enhanced_rag_environment()
+            check_python_environment()
+            setup_enhanced_rag_environment(env)
         else:
-            enhanced_env = setup_enhanced_rag_environment()
+            setup_enhanced_rag_environment(env)
     else:
         print("\n[INFO] Running in basic mode (no Python enhancements)")
-        enhanced_env = os.environ.copy()
-        enhanced_env["RAG_ENABLE_TABLES"] = "0"
-        enhanced_env["RAG_ENABLE_OCR"] = "0"
+        env["RAG_ENABLE_TABLES"] = "0"
+        env["RAG_ENABLE_OCR"] = "0"
+    return env
+
+def main():
+    print("[INFO] Argon Enhanced RAG Runner (Windows Compatible)")
+    ensure_node()
+    npm_cmd = npm_path()
+
+    opts = parse_args(sys.argv)
+    
+    # Setup enhanced RAG environment
+    env = _build_env(opts)
 
     if not opts["no_build"]:
         print("\n[STEP] Building...")
@@ -309,7 +397,7 @@ def main():
     else:
         print("\n[STEP] Skipping build (per --no-build)")
 
-    start_server(enhanced_env)
+    start_server(env)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
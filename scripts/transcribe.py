@@ -1,34 +1,130 @@
 #!/usr/bin/env python3
-import os, sys
+import os, sys, json
+
+def load_faster_whisper():
+    from faster_whisper import WhisperModel
+    model_size = os.getenv("WHISPER_MODEL", "base")
+    # int8 + greedy decoding is several times faster than the defaults on CPU
+    model = WhisperModel(
+        model_size,
+        device=os.getenv("WHISPER_DEVICE", "cpu"),
+        compute_type=os.getenv("WHISPER_COMPUTE", "int8"),
+        cpu_threads=os.cpu_count() or 4,
+    )
+
+    def transcribe(audio_path, on_text=None):
+        segments, info = model.transcribe(
+            audio_path, beam_size=1, vad_filter=True, condition_on_previous_text=False
+        )
+        # Segments are decoded lazily; hand each one out as it arrives
+        parts = []
+        for seg in segments:
+            parts.append(seg.text)
+            if on_text:
+                on_text(seg.text)
+        return "".join(parts).strip()
+    return transcribe
+
+def load_whisper():
+    import whisper
+    model_size = os.getenv("WHISPER_MODEL", "base")
+    model = whisper.load_model(model_size)
+
+    def transcribe(audio_path, on_text=None):
+        result = model.transcribe(audio_path)
+        text = result.get("text","").strip()
+        if on_text:
+            on_text(text)
+        return text
+    return transcribe
+
+# Try faster-whisper if available, fall back to whisper if available, else fail.
+BACKENDS = (load_faster_whisper, load_whisper)
+
+def load_transcriber():
+    """Return a function mapping audio_path -> text, keeping loaded models resident.
+
+    Backends are tried in order: one that fails to load or to transcribe falls
+    through to the next, which is loaded on first use. The last error is raised
+    if none succeeds. The returned function also accepts an optional on_text
+    callback that is fed each piece of text as soon as it is decoded; once any
+    text has been handed out, a failure is raised instead of falling through,
+    so callers never see output from two backends mixed together.
+    """
+    loaded, load_errors = {}, {}
+
+    def transcribe(audio_path, on_text=None):
+        error = None
+        streamed = False
+
+        def relay(text):
+            nonlocal streamed
+            streamed = True
+            on_text(text)
+        for load in BACKENDS:
+            if load in load_errors:  # don't retry a backend that failed to load
+                error = load_errors[load]
+                continue
+            try:
+                if load not in loaded:
+                    loaded[load] = load()
+            except Exception as e:
+                error = load_errors[load] = e
+                continue
+            try:
+                return loaded[load](audio_path, relay if on_text else None)
+            except Exception as e:
+                if streamed:
+                    raise
+                error = e
+        raise error
+    return transcribe
+
+def serve(transcribe):
+    """Keep the model resident: read one audio path per stdin line, answer with one JSON line."""
+    for line in sys.stdin:
+        audio_path = line.strip()
+        if not audio_path:
+            continue
+        try:
+            reply = {"path": audio_path, "text": transcribe(audio_path)}
+        except Exception as e:
+            reply = {"path": audio_path, "error": str(e)}
+        print(json.dumps(reply), flush=True)
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: transcribe.py <audio_path>", file=sys.stderr)
+        print("Usage: transcribe.py <audio_path> | --serve", file=sys.stderr)
         sys.exit(2)
 
-    audio_path = sys.argv[1]
-    # Try faster-whisper if available, fall back to whisper if available, else fail.
-    try:
-        from faster_whisper import WhisperModel
-        model_size = os.getenv("WHISPER_MODEL", "base")
-        model = WhisperModel(model_size)
-        segments, info = model.transcribe(audio_path)
-        text = "".join(seg.text for seg in segments).strip()
-        print(text)
+    transcribe = load_transcriber()
+    if sys.argv[1] == "--serve":
+        serve(transcribe)
         return
-    except Exception as e:
-        pass
+
+    audio_path = sys.argv[1]
+    started, pending = False, ""
+
+    def write(text):
+        # Stream the equivalent of "".join(parts).strip(): drop leading
+        # whitespace, and hold back trailing whitespace until more text follows.
+        nonlocal started, pending
+        if not started:
+            text = text.lstrip()
+        body = text.rstrip()
+        if not body:
+            pending += text
+            return
+        sys.stdout.write(pending + body)
+        sys.stdout.flush()
+        started, pending = True, text[len(body):]
 
     try:
-        import whisper
-        model_size = os.getenv("WHISPER_MODEL", "base")
-        model = whisper.load_model(model_size)
-        result = model.transcribe(audio_path)
-        print(result.get("text","").strip())
-        return
+        transcribe(audio_path, on_text=write)
     except Exception as e:
         print("Whisper not available: " + str(e), file=sys.stderr)
         sys.exit(3)
+    sys.stdout.write("\n")
 
 if __name__ == "__main__":
     main()